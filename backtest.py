@@ -3,12 +3,27 @@
 # Usage: python backtest.py
 #
 # Requires: pip install yfinance pandas numpy
+# Optional: pip install numba  (JIT-compiles the simulation loop)
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
+import os
+from collections import namedtuple
 from datetime import datetime, timedelta
 
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # numba not installed -> kernels run as plain Python
+    HAVE_NUMBA = False
+    prange = range
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 # ---------- CONFIG ----------
 PAIRS = ["GC=F", "EURUSD=X", "GBPUSD=X", "JPY=X", "CAD=X"]
 INTERVAL = "1h"
@@ -16,6 +31,11 @@ END_DATE = "2025-09-06"
 START_DATE = "2024-09-06"
 HORIZON_BARS = 10   # lookahead bars to check TP/SL
 MIN_BARS_REQUIRED = 50
+CACHE_DIR = os.path.join(".cache", "yf")   # downloaded history, reused across runs
+# dtype of the Open/High/Low/ATR arrays fed to the TP/SL scan. np.float32 halves
+# the memory it streams but keeps only ~7 significant digits of each price, so
+# entry/TP/SL in the CSV get rounded; P/L is always accumulated in float64.
+SCAN_DTYPE = np.float64
 
 # Strategy params (match your main bot's params.json defaults)
 PARAMS = {
@@ -33,120 +53,359 @@ PARAMS = {
     "sl_atr_mult": 0.67
 }
 
+# ---------- DATA ----------
+def _cache_path(pair, start, end, interval):
+    # one parquet file per (pair, start, end, interval); delete CACHE_DIR to refetch
+    key = f"{pair}_{start}_{end}_{interval}.parquet".replace("=", "_")
+    return os.path.join(CACHE_DIR, key)
+
+def load_history(pairs, start=START_DATE, end=END_DATE, interval=INTERVAL):
+    # {pair: OHLC DataFrame}; pairs missing from the disk cache are fetched
+    # together in one threaded yf.download call
+    frames = {}
+    missing = []
+    for pair in pairs:
+        path = _cache_path(pair, start, end, interval)
+        if os.path.exists(path):
+            frames[pair] = pd.read_parquet(path)
+        else:
+            missing.append(pair)
+    if not missing:
+        return frames
+    import yfinance as yf  # only needed on a cache miss; a fully cached run never imports yfinance
+    data = yf.download(missing, start=start, end=end, interval=interval, auto_adjust=True,
+                       progress=False, group_by="ticker", threads=True)
+    for pair in missing:
+        if data is None or data.empty:
+            df = None
+        elif isinstance(data.columns, pd.MultiIndex):
+            if pair not in data.columns.get_level_values(0):
+                df = None
+            else:
+                df = data[pair]
+        else:
+            df = data
+        if df is not None:
+            # batched frames share one index; drop the bars this pair doesn't
+            # have, and any bar missing a price the kernels read
+            df = df.dropna(subset=["Open", "High", "Low", "Close"])
+        frames[pair] = df
+        if df is not None and not df.empty:
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                df.to_parquet(_cache_path(pair, start, end, interval))
+            except (ImportError, OSError) as e:
+                print(f"[WARN] Could not cache {pair} data: {e}")
+    return frames
+
 # ---------- INDICATORS ----------
+def _col(df, name, dtype=np.float64):
+    return np.ascontiguousarray(df[name].to_numpy(dtype=dtype))
+
+@njit(cache=True)
+def _rolling_mean(x, window):
+    # O(1)-per-bar running-sum SMA. Mirrors pandas' rolling().mean(): Kahan-
+    # compensated add/remove, the exact value for a constant window, and NaN
+    # bars counted out so a window is NaN only while it contains one.
+    n = len(x)
+    out = np.full(n, np.nan)
+    total = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    nobs = 0
+    same_run = 0
+    prev = np.nan
+    for i in range(n):
+        if i >= window:
+            v = x[i - window]
+            if v == v:
+                nobs -= 1
+                y = -v - comp_remove
+                t = total + y
+                comp_remove = t - total - y
+                total = t
+        v = x[i]
+        if v == v:
+            nobs += 1
+            y = v - comp_add
+            t = total + y
+            comp_add = t - total - y
+            total = t
+            same_run = same_run + 1 if v == prev else 1
+            prev = v
+        if nobs >= window:
+            out[i] = prev if same_run >= nobs else total / nobs
+    return out
+
+@njit(cache=True, inline="always")
+def _ewm_step(weighted, old_wt, x, alpha):
+    # One step of pandas' ewm(adjust=False).mean(): a NaN input carries the
+    # value forward and decays the old weight, a NaN state is seeded by the
+    # next observation. Returns (weighted, old_wt).
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if x == x:
+            if weighted != x:
+                weighted = (old_wt * weighted + alpha * x) / (old_wt + alpha)
+            old_wt = 1.0
+    elif x == x:
+        weighted = x
+    return weighted, old_wt
+
+@njit(cache=True, inline="always")
+def _nanmax(a, b):
+    # max() that skips NaN like DataFrame.max(axis=1)
+    return b if b > a or a != a else a
+
+@njit(cache=True, inline="always")
+def _indicators(close, high, low, sma_fast, sma_slow, macd_fast, macd_slow, macd_signal, rsi_period, atr_period):
+    # Running-sum SMAs, then one pass over the bars for the recursive
+    # (adjust=False) MACD EMAs + signal line, Wilder RSI and Wilder ATR,
+    # stepping NaN bars exactly as pandas' ewm does.
+    n = len(close)
+    sma_f = _rolling_mean(close, sma_fast)
+    sma_s = _rolling_mean(close, sma_slow)
+    macd = np.empty(n)
+    macd_sig = np.empty(n)
+    rsi = np.empty(n)
+    atr = np.empty(n)
+    if n == 0:
+        return sma_f, sma_s, macd, macd_sig, rsi, atr
+    # alphas as pandas derives them: span/alpha -> center of mass -> 1/(1+com)
+    a_fast = 1.0 / (1.0 + (macd_fast - 1) / 2)
+    a_slow = 1.0 / (1.0 + (macd_slow - 1) / 2)
+    a_sig = 1.0 / (1.0 + (macd_signal - 1) / 2)
+    a_rsi = 1.0 / (1.0 + (1.0 - 1.0 / rsi_period) / (1.0 / rsi_period))
+    a_atr = 1.0 / (1.0 + (1.0 - 1.0 / atr_period) / (1.0 / atr_period))
+    ema_fast = ema_slow = close[0]
+    wt_fast = wt_slow = wt_sig = wt_gain = wt_loss = wt_atr = 1.0
+    sig = ema_fast - ema_slow
+    macd[0] = macd_sig[0] = sig
+    rsi[0] = np.nan  # no price change on the first bar
+    atr[0] = atr_i = _nanmax(high[0] - low[0], np.nan)
+    avg_gain = np.nan
+    avg_loss = np.nan
+    for i in range(1, n):
+        c = close[i]
+        ema_fast, wt_fast = _ewm_step(ema_fast, wt_fast, c, a_fast)
+        ema_slow, wt_slow = _ewm_step(ema_slow, wt_slow, c, a_slow)
+        m = ema_fast - ema_slow
+        sig, wt_sig = _ewm_step(sig, wt_sig, m, a_sig)
+        macd[i] = m
+        macd_sig[i] = sig
+        # RSI (gain/loss EWMs start on the first price change; NaN deltas skipped)
+        prev_close = close[i - 1]
+        delta = c - prev_close
+        gain = delta if delta > 0 else (0.0 if delta == delta else np.nan)
+        loss = -delta if delta < 0 else (0.0 if delta == delta else np.nan)
+        avg_gain, wt_gain = _ewm_step(avg_gain, wt_gain, gain, a_rsi)
+        avg_loss, wt_loss = _ewm_step(avg_loss, wt_loss, loss, a_rsi)
+        # 100 - 100/(1 + gain/loss) == 100*gain/(gain+loss); 100 when there are no losses
+        denom = avg_gain + avg_loss
+        rsi[i] = 100.0 * avg_gain / denom if denom > 0 else np.nan
+        # ATR: true range over whichever of the three legs are defined
+        tr = _nanmax(_nanmax(high[i] - low[i], abs(high[i] - prev_close)), abs(low[i] - prev_close))
+        atr_i, wt_atr = _ewm_step(atr_i, wt_atr, tr, a_atr)
+        atr[i] = atr_i
+    return sma_f, sma_s, macd, macd_sig, rsi, atr
+
 def compute_indicators(df):
     df = df.copy()
-    close = df["Close"]
-    df["SMA_fast"] = close.rolling(PARAMS["sma_fast"]).mean()
-    df["SMA_slow"] = close.rolling(PARAMS["sma_slow"]).mean()
-    ema_fast = close.ewm(span=PARAMS["macd_fast"], adjust=False).mean()
-    ema_slow = close.ewm(span=PARAMS["macd_slow"], adjust=False).mean()
-    df["MACD"] = ema_fast - ema_slow
-    df["MACD_SIGNAL"] = df["MACD"].ewm(span=PARAMS["macd_signal"], adjust=False).mean()
-    # RSI
-    delta = close.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    avg_gain = gain.ewm(alpha=1/PARAMS["rsi_period"], adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1/PARAMS["rsi_period"], adjust=False).mean()
-    rs = avg_gain / avg_loss.replace(0, np.nan)
-    df["RSI"] = 100 - (100 / (1 + rs))
-    # ATR
-    prev_close = close.shift(1)
-    tr = pd.concat([(df["High"] - df["Low"]),
-                    (df["High"] - prev_close).abs(),
-                    (df["Low"] - prev_close).abs()], axis=1).max(axis=1)
-    df["ATR"] = tr.ewm(alpha=1/14, adjust=False).mean()
+    (df["SMA_fast"], df["SMA_slow"], df["MACD"], df["MACD_SIGNAL"], df["RSI"], df["ATR"]) = KERNELS.indicators(
+        _col(df, "Close"), _col(df, "High"), _col(df, "Low"))
     return df
 
-# ---------- SIGNAL RULE ----------
-def signal_on_bar(row, prev_row):
-    # row and prev_row are Series with indicators already computed
-    # ensure NaNs are handled
-    keys = ["SMA_fast", "SMA_slow", "MACD", "MACD_SIGNAL", "RSI", "ATR"]
-    if any(pd.isna(row.get(k, np.nan)) for k in keys):
-        return "HOLD"
-    sma_f = float(row["SMA_fast"]); sma_s = float(row["SMA_slow"])
-    macd = float(row["MACD"]); macd_signal = float(row["MACD_SIGNAL"])
-    rsi = float(row["RSI"])
-    trend_up = sma_f > sma_s
-    trend_down = sma_f < sma_s
-    macd_cross_up = macd > macd_signal
-    macd_cross_down = macd < macd_signal
-    rsi_ok_long = PARAMS["rsi_ok_long_min"] <= rsi <= PARAMS["rsi_ok_long_max"]
-    rsi_ok_short = PARAMS["rsi_ok_short_min"] <= rsi <= PARAMS["rsi_ok_short_max"]
-    if trend_up and macd_cross_up and rsi_ok_long:
-        return "BUY"
-    if trend_down and macd_cross_down and rsi_ok_short:
-        return "SELL"
-    return "HOLD"
-
 # ---------- SIMULATE TRADES ----------
-def backtest_pair(pair):
-    print(f"\nBacktesting {pair} from {START_DATE} to {END_DATE} ({INTERVAL})")
-    df = yf.download(pair, start=START_DATE, end=END_DATE, interval=INTERVAL, auto_adjust=True, progress=False)
-    if df is None or df.empty or len(df) < MIN_BARS_REQUIRED:
-        print("Insufficient historical data for", pair)
-        return None
-    df = compute_indicators(df)
-    trades = []
-    # iterate bars (we enter at next bar open)
-    for i in range(1, len(df) - HORIZON_BARS):
-        row = df.iloc[i]       # this bar's indicators determine signal
-        prev_row = df.iloc[i-1]
-        sig = signal_on_bar(row, prev_row)
-        if sig == "HOLD":
+RESULT_NO_HIT, RESULT_WIN, RESULT_LOSS = 0, 1, 2
+RESULT_NAMES = np.array(["no_hit", "win", "loss"])
+TRADE_DTYPE = np.dtype([
+    ("signal_idx", "i8"),     # bar that produced the signal; entry is the next bar
+    ("direction", "i1"),      # +1 BUY, -1 SELL
+    ("entry_price", "f8"),
+    ("tp", "f8"),
+    ("sl", "f8"),
+    ("result", "u1"),         # RESULT_* code
+    ("pnl", "f8"),
+    ("return_pct", "f8"),
+])
+
+@njit(cache=True, inline="always")
+def _simulate(trades, open_, high, low, atr, sma_f, sma_s, macd, macd_sig, rsi,
+              tp_mult, sl_mult, horizon, rsi_lmin, rsi_lmax, rsi_smin, rsi_smax):
+    # One pass over the bars: signal rule + first TP/SL touch within horizon.
+    # Fills the preallocated TRADE_DTYPE array `trades` (len >= bars) and
+    # returns how many records were written.
+    n = len(open_)
+    count = 0
+    for i in range(1, n - horizon):
+        a = atr[i]
+        if not a > 0:  # NaN or no volatility measure
             continue
-        entry_idx = i + 1
-        if entry_idx >= len(df):
-            break
-        entry_price = df["Open"].iloc[entry_idx]
-        atr = row["ATR"] if not pd.isna(row["ATR"]) else None
-        if atr is None or atr <= 0:
-            # skip if no volatility measure
+        r = rsi[i]
+        if sma_f[i] > sma_s[i] and macd[i] > macd_sig[i] and r >= rsi_lmin and r <= rsi_lmax:
+            d = 1
+        elif sma_f[i] < sma_s[i] and macd[i] < macd_sig[i] and r >= rsi_smin and r <= rsi_smax:
+            d = -1
+        else:
             continue
-        tp = entry_price + PARAMS["tp_atr_mult"] * atr if sig == "BUY" else entry_price - PARAMS["tp_atr_mult"] * atr
-        sl = entry_price - PARAMS["sl_atr_mult"] * atr if sig == "BUY" else entry_price + PARAMS["sl_atr_mult"] * atr
-        result = "no_hit"
-        win = 0.0
-        # check next HORIZON_BARS bars for hit
-        for j in range(entry_idx, min(len(df), entry_idx + HORIZON_BARS)):
-            high = df["High"].iloc[j]; low = df["Low"].iloc[j]
-            if sig == "BUY":
-                if high >= tp and not (low <= sl and df.index.get_loc(df.index[df.index.get_loc(df.index[j])] ) < df.index.get_loc(df.index[df.index[df.index.get_loc(df.index[j])]])):  # simple
-                    result = "win"; win = tp - entry_price; break
-                if low <= sl:
-                    result = "loss"; win = sl - entry_price; break
+        # we enter at next bar open; no trade without a usable entry price
+        entry = open_[i + 1]
+        if not np.isfinite(entry):
+            continue
+        tp = entry + d * tp_mult * a
+        sl = entry - d * sl_mult * a
+        res = RESULT_NO_HIT
+        pnl = 0.0
+        for j in range(i + 1, i + 1 + horizon):
+            if d == 1:
+                tp_touch = high[j] >= tp
+                sl_touch = low[j] <= sl
             else:
-                if low <= tp:
-                    result = "win"; win = entry_price - tp; break
-                if high >= sl:
-                    result = "loss"; win = entry_price - sl; break
-        trades.append({
-            "pair": pair,
-            "entry_time": df.index[entry_idx],
-            "signal_time": df.index[i],
-            "signal": sig,
-            "entry_price": float(entry_price),
-            "tp": float(tp),
-            "sl": float(sl),
-            "result": result,
-            "pnl": float(win) if result in ("win","loss") else 0.0,
-            "return_pct": (float(win) / float(entry_price)) if result in ("win","loss") else 0.0
-        })
+                tp_touch = low[j] <= tp
+                sl_touch = high[j] >= sl
+            # both levels touched in one bar: assume SL filled first (no optimistic bias)
+            if sl_touch:
+                res = RESULT_LOSS
+                pnl = d * (sl - entry)
+                break
+            if tp_touch:
+                res = RESULT_WIN
+                pnl = d * (tp - entry)
+                break
+        t = trades[count]
+        t["signal_idx"] = i
+        t["direction"] = d
+        t["entry_price"] = entry
+        t["tp"] = tp
+        t["sl"] = sl
+        t["result"] = res
+        t["pnl"] = pnl
+        t["return_pct"] = pnl / entry if res != RESULT_NO_HIT else 0.0
+        count += 1
+    return count
+
+def _simulate_numpy(trades, open_, high, low, atr, sma_f, sma_s, macd, macd_sig, rsi,
+                    tp_mult, sl_mult, horizon, rsi_lmin, rsi_lmax, rsi_smin, rsi_smax):
+    # Same contract as _simulate, vectorized for when numba isn't installed:
+    # signal masks over all bars, then one (signals x horizon) window compare.
+    n = len(open_)
+    with np.errstate(invalid="ignore"):
+        buy = (sma_f > sma_s) & (macd > macd_sig) & (rsi >= rsi_lmin) & (rsi <= rsi_lmax)
+        sell = ~buy & (sma_f < sma_s) & (macd < macd_sig) & (rsi >= rsi_smin) & (rsi <= rsi_smax)
+        idx = np.flatnonzero((buy | sell) & (atr > 0))
+    idx = idx[(idx >= 1) & (idx < n - horizon)]
+    idx = idx[np.isfinite(open_[idx + 1])]  # no trade without a usable entry price
+    count = len(idx)
+    if count == 0:
+        return 0
+    d = np.where(buy[idx], 1, -1)
+    entry = open_[idx + 1]
+    a = atr[idx]
+    tp = entry + d * tp_mult * a
+    sl = entry - d * sl_mult * a
+    # zero-copy (bars x horizon) views; row k covers the bars after entry idx[k]
+    hi_w = sliding_window_view(high, horizon)[idx + 1]
+    lo_w = sliding_window_view(low, horizon)[idx + 1]
+    is_buy = (d == 1)[:, None]
+    tp_touch = np.where(is_buy, hi_w >= tp[:, None], lo_w <= tp[:, None])
+    sl_touch = np.where(is_buy, lo_w <= sl[:, None], hi_w >= sl[:, None])
+    # both levels touched in one bar: assume SL filled first (no optimistic bias)
+    win_bar = tp_touch & ~sl_touch
+    first_win = np.where(win_bar.any(axis=1), win_bar.argmax(axis=1), horizon)
+    first_sl = np.where(sl_touch.any(axis=1), sl_touch.argmax(axis=1), horizon)
+    win = (first_win < horizon) & (first_win <= first_sl)
+    loss = ~win & (first_sl < horizon)
+    pnl = np.where(win, d * (tp - entry), np.where(loss, d * (sl - entry), 0.0))
+    out = trades[:count]
+    out["signal_idx"] = idx
+    out["direction"] = d
+    out["entry_price"] = entry
+    out["tp"] = tp
+    out["sl"] = sl
+    out["result"] = np.where(win, RESULT_WIN, np.where(loss, RESULT_LOSS, RESULT_NO_HIT))
+    out["pnl"] = pnl
+    out["return_pct"] = np.where(win | loss, pnl / entry, 0.0)
+    return count
+
+# indicators(close, high, low) and simulate_all(trades, counts, lengths,
+# open_s, high_s, low_s, close, high, low) with one PARAMS set baked in
+Kernels = namedtuple("Kernels", ["indicators", "simulate_all"])
+
+def make_kernels(params=PARAMS, horizon=HORIZON_BARS, atr_period=14):
+    # Strategy constants are captured by closure: numba freezes closure
+    # variables as compile-time constants, so each window/alpha/threshold is
+    # folded into the inlined kernel body instead of passed at runtime.
+    sma_fast, sma_slow = params["sma_fast"], params["sma_slow"]
+    macd_fast, macd_slow, macd_signal = params["macd_fast"], params["macd_slow"], params["macd_signal"]
+    rsi_period = params["rsi_period"]
+    tp_mult, sl_mult = params["tp_atr_mult"], params["sl_atr_mult"]
+    # with a > 0 this puts TP/SL on the right side of entry (BUY: tp > entry > sl,
+    # SELL: sl > entry > tp); checked here once, not per trade inside the kernel
+    if not (tp_mult > 0 and sl_mult > 0):
+        raise ValueError(f"tp_atr_mult and sl_atr_mult must be > 0, got {tp_mult}, {sl_mult}")
+    rsi_lmin, rsi_lmax = params["rsi_ok_long_min"], params["rsi_ok_long_max"]
+    rsi_smin, rsi_smax = params["rsi_ok_short_min"], params["rsi_ok_short_max"]
+    # the numba kernel when it compiles, otherwise the vectorized NumPy version
+    sim = _simulate if HAVE_NUMBA else _simulate_numpy
+
+    @njit(cache=True)
+    def indicators(close, high, low):
+        return _indicators(close, high, low, sma_fast, sma_slow,
+                           macd_fast, macd_slow, macd_signal, rsi_period, atr_period)
+
+    @njit(cache=True, parallel=True)
+    def simulate_all(trades, counts, lengths, open_s, high_s, low_s, close, high, low):
+        # Row p of every 2D input holds pair p's lengths[p] bars (NaN-padded);
+        # pairs are independent, so they run across cores via prange.
+        # *_s are the SCAN_DTYPE copies for the TP/SL scan; writes counts[p].
+        # The inlined body must keep a single exit (no assert/raise/return),
+        # otherwise numba silently runs this prange serially; check with
+        # simulate_all.parallel_diagnostics(level=1).
+        for p in prange(len(lengths)):
+            n = lengths[p]
+            sma_f, sma_s, macd, macd_sig, rsi, atr = _indicators(
+                close[p, :n], high[p, :n], low[p, :n], sma_fast, sma_slow,
+                macd_fast, macd_slow, macd_signal, rsi_period, atr_period)
+            atr_s = atr.astype(high_s.dtype)
+            counts[p] = sim(trades[p], open_s[p, :n], high_s[p, :n], low_s[p, :n], atr_s,
+                            sma_f, sma_s, macd, macd_sig, rsi,
+                            tp_mult, sl_mult, horizon, rsi_lmin, rsi_lmax, rsi_smin, rsi_smax)
+
+    return Kernels(indicators, simulate_all)
+
+KERNELS = make_kernels()
+
+def _report(pair, index, trades):
+    # trades: this pair's filled TRADE_DTYPE records; index: its bar timestamps
     # compute metrics
-    total = len([t for t in trades if t["result"] in ("win","loss")])
-    wins = len([t for t in trades if t["result"] == "win"])
-    losses = len([t for t in trades if t["result"] == "loss"])
+    result = trades["result"]; pnl = trades["pnl"]
+    win_mask = result == RESULT_WIN
+    loss_mask = result == RESULT_LOSS
+    wins = int(win_mask.sum())
+    losses = int(loss_mask.sum())
+    total = wins + losses
     win_rate = (wins/total*100) if total>0 else 0.0
-    gross_win = sum(t["pnl"] for t in trades if t["result"]=="win")
-    gross_loss = sum(-t["pnl"] for t in trades if t["result"]=="loss")
+    gross_win = float(pnl[win_mask].sum())
+    gross_loss = float(-pnl[loss_mask].sum())
     profit_factor = (gross_win / gross_loss) if gross_loss>0 else float("inf")
-    avg_return = (sum(t["return_pct"] for t in trades if t["result"] in ("win","loss")) / total*100) if total>0 else 0.0
+    # no_hit trades carry return_pct == 0, so summing every row is the same as summing wins + losses
+    avg_return = (float(trades["return_pct"].sum()) / total*100) if total>0 else 0.0
     print(f"Trades={total}, Wins={wins}, Losses={losses}, WinRate={win_rate:.1f}%, ProfitFactor={profit_factor:.3f}, AvgReturn%={avg_return:.4f}")
     # save detailed trades CSV
-    if trades:
-        outdf = pd.DataFrame(trades)
+    if len(trades):
+        signal_idx = trades["signal_idx"]
+        outdf = pd.DataFrame({
+            "pair": pair,
+            "entry_time": index[signal_idx + 1],
+            "signal_time": index[signal_idx],
+            "signal": np.where(trades["direction"] == 1, "BUY", "SELL"),
+            "entry_price": trades["entry_price"],
+            "tp": trades["tp"],
+            "sl": trades["sl"],
+            "result": RESULT_NAMES[trades["result"]],
+            "pnl": trades["pnl"],
+            "return_pct": trades["return_pct"],
+        })
         outdf.to_csv(f"backtest_{pair.replace('=','_')}.csv", index=False)
     return {
         "pair": pair,
@@ -154,12 +413,45 @@ def backtest_pair(pair):
         "win_rate": win_rate, "profit_factor": profit_factor, "avg_return_pct": avg_return
     }
 
-if _name_ == "_main_":
+def backtest_all(history):
+    # history: {pair: OHLC DataFrame} (see load_history). All usable pairs are
+    # stacked into NaN-padded (pairs x bars) arrays and simulated in one call.
+    frames = {pair: df for pair, df in history.items()
+              if df is not None and not df.empty and len(df) >= MIN_BARS_REQUIRED}
+    if frames:
+        lengths = np.array([len(df) for df in frames.values()], dtype=np.int64)
+
+        def stack(name, dtype=np.float64):
+            out = np.full((len(frames), lengths.max()), np.nan, dtype=dtype)
+            for p, df in enumerate(frames.values()):
+                out[p, :len(df)] = df[name].to_numpy(dtype=dtype)
+            return out
+
+        close, high, low = stack("Close"), stack("High"), stack("Low")
+        trades = np.empty((len(frames), lengths.max()), dtype=TRADE_DTYPE)
+        counts = np.zeros(len(frames), dtype=np.int64)
+        KERNELS.simulate_all(trades, counts, lengths, stack("Open", SCAN_DTYPE),
+                             high.astype(SCAN_DTYPE, copy=False), low.astype(SCAN_DTYPE, copy=False),
+                             close, high, low)
+        pair_trades = {pair: trades[p, :counts[p]] for p, pair in enumerate(frames)}
     results = []
-    for p in PAIRS:
-        res = backtest_pair(p)
-        if res:
-            results.append(res)
+    for pair in history:
+        print(f"\nBacktesting {pair} from {START_DATE} to {END_DATE} ({INTERVAL})")
+        if pair not in frames:
+            print("Insufficient historical data for", pair)
+            continue
+        results.append(_report(pair, frames[pair].index, pair_trades[pair]))
+    return results
+
+def backtest_pair(pair, df=None):
+    # df: this pair's OHLC history (from load_history); fetched when omitted
+    if df is None:
+        df = load_history([pair])[pair]
+    results = backtest_all({pair: df})
+    return results[0] if results else None
+
+if __name__ == "__main__":
+    results = backtest_all(load_history(PAIRS))
     if results:
         summary = pd.DataFrame(results)
         print("\nSUMMARY:")
@@ -1,6 +1,16 @@
 # create_test_model.py
+import os
 import pickle
-from sklearn.ensemble import RandomForestClassifier
+import sys
+
+MODEL_FILE = "ml_model.pkl"
+
+# Inputs below are constants: skip retraining if the model is newer than this script
+if os.path.exists(MODEL_FILE) and os.path.getmtime(MODEL_FILE) > os.path.getmtime(__file__):
+    print(f"✅ {MODEL_FILE} is up to date, skipping retrain (delete it to force)")
+    sys.exit(0)
+
+from sklearn.ensemble import RandomForestClassifier  # heavy import, only when retraining
 
 # 4 dummy features: ['Open','High','Low','Close']
 X = [
@@ -15,7 +25,7 @@ model = RandomForestClassifier()
 model.fit(X, y)
 
 # Save with protocol 4 for PyInstaller
-with open("ml_model.pkl", "wb") as f:
+with open(MODEL_FILE, "wb") as f:
     pickle.dump(model, f, protocol=4)
 
 print("✅ Clean ml_model.pkl created with 4 features (protocol 4)")
@@ -1,23 +1,28 @@
 # dashboard.py
+import sys
+from collections import Counter
 import config
 from colorama import Fore, Style
 
-def show_dashboard(trades):
-    print("\n=== DASHBOARD ===")
-    active_trades = [t for t in trades if t["status"] == "OPEN"]
-    closed_trades = [t for t in trades if t["status"] == "CLOSED"]
+HEADER = (
+    "PAIR     DIR   ENTRY      NOW        SL       P/L      TP HIT   STATUS\n"
+    "----------------------------------------------------------------------"
+)
+ROW_TMPL = "{pair:7} {dir:4} {entry:.5f}  {now:.5f}  {sl:.5f}  {pl:.2f}  {tp_hit}   {status}"
 
-    print(
-        f"Mode: {config.MODE} | Active trades: {len(active_trades)} | Closed trades: {len(closed_trades)} | Balance: {config.BALANCE:.2f}"
-    )
+def show_dashboard(trades):
+    # build the whole frame first and write it once instead of a print() per row
+    counts = Counter(t["status"] for t in trades)
 
-    print("\nPAIR     DIR   ENTRY      NOW        SL       P/L      TP HIT   STATUS")
-    print("----------------------------------------------------------------------")
-    for trade in trades:
-        print(
-            f"{trade['pair']:7} {trade['dir']:4} {trade['entry']:.5f}  {trade['now']:.5f}  {trade['sl']:.5f}  {trade['pl']:.2f}  {trade['tp_hit']}   {trade['status']}"
-        )
+    lines = [
+        "\n=== DASHBOARD ===",
+        f"Mode: {config.MODE} | Active trades: {counts['OPEN']} | Closed trades: {counts['CLOSED']} | Balance: {config.BALANCE:.2f}",
+        "\n" + HEADER,
+    ]
+    lines.extend(ROW_TMPL.format_map(trade) for trade in trades)
 
     # Removed EMA/RSI debug completely
 
-    print("=================")
+    lines.append("=================")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
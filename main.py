@@ -4,7 +4,8 @@ import pandas as pd
 import time
 import sys
 import os
-from signals_ml import generate_signal, log_signal
+from datetime import datetime
+from signals_ml import generate_signal, log_signals, SIGNAL_TIMEFRAMES, LOG_TIME_FORMAT
 from trade import execute_trade
 from dashboard import show_dashboard  # keep dashboard separate
 
@@ -28,6 +29,9 @@ timeframes = {
     'H1': mt5.TIMEFRAME_H1
 }
 
+CYCLE_SECONDS = 60  # one cycle per M1 bar
+BAR_CLOSE_DELAY = 2  # seconds past the boundary, so MT5 has rolled over to the new bar
+
 candles_per_tf_dict = {
     'M1': 50,
     'M5': 30,
@@ -56,14 +60,19 @@ print("[INFO] Connected to MT5 successfully")
 # Fetch live data
 # -----------------------------
 def get_live_data(pair, timeframe, n=50):
-    rates = mt5.copy_rates_from_pos(pair, timeframe, 0, n)
+    # Start at position 1: position 0 is the bar still forming, so the last
+    # row is always the most recent closed bar
+    rates = mt5.copy_rates_from_pos(pair, timeframe, 1, n)
     if rates is None or len(rates) == 0:
         return pd.DataFrame()
-    df = pd.DataFrame(rates)
-    df['time'] = pd.to_datetime(df['time'], unit='s')
-    return df[['time','open','high','low','close']].rename(
-        columns={'open':'Open','high':'High','low':'Low','close':'Close'}
-    )
+    # Build straight from the record fields we use; skips the full-frame copy and rename
+    return pd.DataFrame({
+        'time': pd.to_datetime(rates['time'], unit='s'),
+        'Open': rates['open'],
+        'High': rates['high'],
+        'Low': rates['low'],
+        'Close': rates['close'],
+    })
 
 # -----------------------------
 # Track trades for dashboard
@@ -76,11 +85,13 @@ trades_list = []  # Each trade: {"pair","dir","entry","now","sl","pl","tp_hit","
 try:
     while True:
         print("\n[INFO] Fetching live ML signals...")
+        cycle_time = datetime.now().strftime(LOG_TIME_FORMAT)  # one timestamp per cycle
+        cycle_signals = []
         for pair in pairs:
-            # Fetch multiple timeframe data
+            # Fetch only the timeframes the signal reads, once per cycle
             pair_data_dict = {
-                tf: get_live_data(pair, tf_id, candles_per_tf_dict.get(tf, 50))
-                for tf, tf_id in timeframes.items()
+                tf: get_live_data(pair, timeframes[tf], candles_per_tf_dict.get(tf, 50))
+                for tf in SIGNAL_TIMEFRAMES
             }
 
             # Generate signal
@@ -91,16 +102,19 @@ try:
             if trade_info:
                 trades_list.append(trade_info)
 
-            # Log signal using signals_ml.py
-            log_signal(pair, signal)
+            cycle_signals.append((pair, signal))
 
             print(f"{pair} → Signal={signal}")
 
+        # Log the whole cycle's signals in one append (signals_ml.py)
+        log_signals(cycle_signals, cycle_time)
+
         # Update dashboard (TP info included)
         show_dashboard(trades_list)
 
-        # Wait 60 seconds before next iteration
-        time.sleep(60)
+        # Sleep until just after the next M1 bar closes so cycles don't drift with work time
+        next_cycle = (int(time.time()) // CYCLE_SECONDS + 1) * CYCLE_SECONDS + BAR_CLOSE_DELAY
+        time.sleep(max(0, next_cycle - time.time()))
 
 except KeyboardInterrupt:
     print("[INFO] Stopped by user")
@@ -1,5 +1,5 @@
 # signals_ml.py
-import pandas as pd
+import csv
 import pickle
 import sys
 import os
@@ -17,6 +17,12 @@ else:
 model_path = os.path.join(base_path, "ml_model.pkl")
 log_path = os.path.join(base_path, "ml_signals_log.csv")
 
+# Timeframes generate_signal actually reads from pair_data_dict
+SIGNAL_TIMEFRAMES = ('M1',)
+FEATURE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+LOG_COLUMNS = ['datetime', 'pair', 'signal']
+LOG_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 # -----------------------------
 # Load trained ML model
 # -----------------------------
@@ -47,8 +53,8 @@ def generate_signal(pair, pair_data_dict, candles_per_tf_dict):
     if df_m1 is None or df_m1.empty:
         return None
 
-    latest_candle = df_m1.iloc[-1]
-    features = [latest_candle['Open'], latest_candle['High'], latest_candle['Low'], latest_candle['Close']]
+    # Scalar fast path on the latest candle instead of materialising a row Series
+    features = [df_m1[col].iat[-1] for col in FEATURE_COLUMNS]
 
     try:
         pred = model.predict([features])[0]
@@ -60,19 +66,24 @@ def generate_signal(pair, pair_data_dict, candles_per_tf_dict):
 # -----------------------------
 # Log signal to CSV
 # -----------------------------
-def log_signal(pair, signal):
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    row = {"datetime": now, "pair": pair, "signal": signal}
+def log_signal(pair, signal, now=None):
+    log_signals([(pair, signal)], now)
+
+def log_signals(signals, now=None):
+    """Append (pair, signal) pairs to the log in a single open/write."""
+    # callers logging a batch can pass one pre-formatted timestamp
+    if now is None:
+        now = datetime.now().strftime(LOG_TIME_FORMAT)
 
     try:
-        if not os.path.exists(log_path):
-            df = pd.DataFrame([row])
-            df.to_csv(log_path, index=False)
-        else:
-            df = pd.read_csv(log_path)
-            df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-            df.to_csv(log_path, index=False)
+        # Append rows instead of re-reading and rewriting the whole log
+        write_header = not os.path.exists(log_path)
+        with open(log_path, "a", newline="") as f:
+            writer = csv.writer(f, lineterminator=os.linesep)  # match earlier to_csv output
+            if write_header:
+                writer.writerow(LOG_COLUMNS)
+            writer.writerows([now, pair, signal] for pair, signal in signals)
         # Optional print for monitoring
-        # print(f"[INFO] Logged signal: {pair} → {signal}")
+        # print(f"[INFO] Logged signals: {signals}")
     except Exception as e:
         print(f"❌ Failed to log signal: {e}")
@@ -8,31 +8,33 @@ from signals import generate_signal
 # --- Global trade list ---
 trades = []
 
+# --- Per-pair TP/SL settings ---
+def _pair_settings(pair):
+    """(digits, tp_offsets, sl_offset) for a symbol, offsets already in price units."""
+    # ✅ Determine pair type safely
+    pair_type = "GOLD" if pair.upper() == "XAUUSD" else "FOREX"
+    pip_unit, digits = (1, 2) if pair_type == "GOLD" else (0.0001, 5)
+    tp_offsets = tuple(tp * pip_unit for tp in config.TP_VALUES.get(pair_type, []))
+    return digits, tp_offsets, config.SL_VALUES.get(pair_type, 0) * pip_unit
+
+# Resolved once per configured pair instead of on every trade
+PAIR_SETTINGS = {pair: _pair_settings(pair) for pair in config.PAIRS}
+
 # --- Create a new trade ---
 def create_trade(pair, direction, lot_size):
     tick = mt5.symbol_info_tick(pair)
     if not tick:
         return None
 
-    entry = tick.bid if direction == "BUY" else tick.ask
+    sign = 1 if direction == "BUY" else -1
+    entry = tick.bid if sign > 0 else tick.ask
 
-    # ✅ Determine pair type safely
-    if pair.upper() == "XAUUSD":
-        pair_type = "GOLD"
-    else:
-        pair_type = "FOREX"
-
-    # ✅ Pull TP/SL settings for this type
-    tp_values = config.TP_VALUES.get(pair_type, [])
-    sl_value = config.SL_VALUES.get(pair_type, 0)
+    # ✅ Pull TP/SL settings for this pair
+    digits, tp_offsets, sl_offset = PAIR_SETTINGS.get(pair) or _pair_settings(pair)
 
     # ✅ Build TP levels & SL
-    if pair_type == "FOREX":
-        tp_levels = [round(entry + (tp * 0.0001 if direction == "BUY" else -tp * 0.0001), 5) for tp in tp_values]
-        sl_val = round(entry - (sl_value * 0.0001) if direction == "BUY" else entry + (sl_value * 0.0001), 5)
-    else:  # GOLD
-        tp_levels = [round(entry + (tp if direction == "BUY" else -tp), 2) for tp in tp_values]
-        sl_val = round(entry - sl_value if direction == "BUY" else entry + sl_value, 2)
+    tp_levels = [round(entry + sign * off, digits) for off in tp_offsets]
+    sl_val = round(entry - sign * sl_offset, digits)
 
     trade = {
         "pair": pair,
@@ -54,41 +56,34 @@ def create_trade(pair, direction, lot_size):
 # --- Update all open trades ---
 def update_trades(trade_list):
     updated_trades = []
+    # One tick per symbol, shared by every trade open on it
+    ticks = {pair: mt5.symbol_info_tick(pair) for pair in {t["pair"] for t in trade_list}}
+    now = datetime.now()  # one timestamp for every trade closed in this update
     for trade in trade_list:
-        tick = mt5.symbol_info_tick(trade["pair"])
+        tick = ticks[trade["pair"]]
         if not tick:
             updated_trades.append(trade)
             continue
 
-        price = tick.bid if trade["direction"] == "BUY" else tick.ask
+        # +1 BUY / -1 SELL: folds the direction branches into the arithmetic below
+        sign = 1 if trade["direction"] == "BUY" else -1
+        price = tick.bid if sign > 0 else tick.ask
         trade["current_price"] = price
 
         # --- Profit calculation ---
-        if trade["direction"] == "BUY":
-            trade["profit"] = (price - trade["entry"]) * trade["lot_size"] * 100000
-        else:
-            trade["profit"] = (trade["entry"] - price) * trade["lot_size"] * 100000
+        trade["profit"] = (price - trade["entry"]) * sign * trade["lot_size"] * 100000
 
         # --- Check TP / partial close / BE ---
         for idx, tp in enumerate(trade["tp_levels"]):
-            if trade["direction"] == "BUY" and price >= tp:
-                if idx + 1 > trade["current_tp"]:
-                    trade["current_tp"] = idx + 1
-                    if trade["current_tp"] >= 2 and trade["status"] == "OPEN":
-                        trade["status"] = "BE"
-            elif trade["direction"] == "SELL" and price <= tp:
-                if idx + 1 > trade["current_tp"]:
-                    trade["current_tp"] = idx + 1
-                    if trade["current_tp"] >= 2 and trade["status"] == "OPEN":
-                        trade["status"] = "BE"
+            if sign * (price - tp) >= 0 and idx + 1 > trade["current_tp"]:
+                trade["current_tp"] = idx + 1
+                if trade["current_tp"] >= 2 and trade["status"] == "OPEN":
+                    trade["status"] = "BE"
 
         # --- Check SL hit ---
-        if trade["direction"] == "BUY" and price <= trade["sl"]:
-            trade["status"] = "CLOSED"
-            trade["closed_at"] = datetime.now()
-        elif trade["direction"] == "SELL" and price >= trade["sl"]:
+        if sign * (trade["sl"] - price) >= 0:
             trade["status"] = "CLOSED"
-            trade["closed_at"] = datetime.now()
+            trade["closed_at"] = now
 
         updated_trades.append(trade)
 